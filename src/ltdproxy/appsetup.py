@@ -2,23 +2,33 @@
 
 from __future__ import annotations
 
+from copy import copy
 from importlib.metadata import metadata, version
 from typing import TYPE_CHECKING
 
-from .handlers.external import external_router
-from .handlers.healthcheck import health_router
-from .handlers.internal import internal_router
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from starlette.routing import request_response
 
-if TYPE_CHECKING:
-    from fastapi import FastAPI
+from .fastapiutils import install_cloned_types_cache
+
+# Install before the handler modules create their routes
+install_cloned_types_cache()
+
+# isort: split
+
+from .handlers.external import external_router  # noqa: E402
+from .handlers.healthcheck import health_router  # noqa: E402
+from .handlers.internal import internal_router  # noqa: E402
 
+if TYPE_CHECKING:
     from ltdproxy.config import Configuration
 
 
 def add_handlers(*, config: Configuration, app: FastAPI) -> None:
     if config.path_prefix == "/":
-        app.include_router(health_router)
-        app.include_router(external_router)
+        _add_routes(app=app, router=health_router)
+        _add_routes(app=app, router=external_router)
     else:
         external_app = FastAPI(
             title="ltd-proxy",
@@ -26,8 +36,24 @@ def add_handlers(*, config: Configuration, app: FastAPI) -> None:
             version=version("ltd-proxy"),
             openapi_url=None,
         )
-        external_app.include_router(external_router)
+        _add_routes(app=external_app, router=external_router)
 
-        app.include_router(internal_router)
-        app.include_router(health_router)
+        _add_routes(app=app, router=internal_router)
+        _add_routes(app=app, router=health_router)
         app.mount(f"{config.path_prefix}", external_app)
+
+
+def _add_routes(*, app: FastAPI, router: APIRouter) -> None:
+    """Add a router's routes to an app without prefixing.
+
+    Unlike ``app.include_router``, this does not re-create each route, which
+    re-runs the route's dependency introspection and response model cloning.
+    Instead each API route is shallow-copied and its ASGI handler rebuilt so
+    that it resolves dependencies through ``app.dependency_overrides``.
+    """
+    for route in router.routes:
+        if isinstance(route, APIRoute):
+            route = copy(route)
+            route.dependency_overrides_provider = app
+            route.app = request_response(route.get_route_handler())
+        app.router.routes.append(route)
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import os
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional, cast
 
 from pydantic import BaseSettings, Field, FilePath, HttpUrl, SecretStr
 
-__all__ = ["Configuration", "config", "Profile", "LogLevel"]
+__all__ = ["Configuration", "config", "get_config", "Profile", "LogLevel"]
 
 
 class LogLevel(str, Enum):
@@ -70,6 +71,17 @@ class Configuration(BaseSettings):
 
     rewrites_config_path: FilePath = Field(env="LTDPROXY_REWRITES_CONFIG")
 
+    stream_chunk_size: Optional[int] = Field(
+        None,
+        gt=0,
+        description=(
+            "The size, in bytes, of the chunks that responses from S3 and "
+            "rewrite backends are streamed in. By default, each chunk is "
+            "sent as it is read from the network, without re-chunking."
+        ),
+        env="LTDPROXY_STREAM_CHUNK_SIZE",
+    )
+
     healthcheck_bucket_key: Optional[str] = Field(
         None,
         description=(
@@ -81,5 +93,35 @@ class Configuration(BaseSettings):
     )
 
 
-config = Configuration(_env_file=os.getenv("LTD_PROXY_ENV"))
-"""Configuration for ltd-proxy."""
+@lru_cache(maxsize=1)
+def get_config() -> Configuration:
+    """Get the configuration for ltd-proxy.
+
+    The configuration is created on the first call and cached. Tests can
+    call ``get_config.cache_clear()`` to have the configuration re-read from
+    the environment.
+    """
+    return Configuration(_env_file=os.getenv("LTD_PROXY_ENV"))
+
+
+class _LazyConfiguration:
+    """A proxy that gets the `Configuration` from a factory function when an
+    attribute is accessed.
+
+    This means that importing the config module (for example, for the
+    `Profile` enum) doesn't read the environment and ``.env`` file, or fail
+    when required settings are absent.
+    """
+
+    def __init__(self, factory: Callable[[], Configuration]) -> None:
+        self._factory = factory
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._factory(), name)
+
+
+config = cast(Configuration, _LazyConfiguration(get_config))
+"""Configuration for ltd-proxy.
+
+Attribute access is forwarded to the configuration from `get_config`.
+"""
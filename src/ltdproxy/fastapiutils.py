@@ -0,0 +1,56 @@
+"""Utilities that adjust FastAPI's route registration."""
+
+from __future__ import annotations
+
+from typing import Dict, MutableMapping, Optional, Type, cast
+from weakref import WeakKeyDictionary
+
+import fastapi.routing
+import fastapi.utils
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+
+__all__ = ["install_cloned_types_cache"]
+
+_cloned_types: MutableMapping[Type[BaseModel], Type[BaseModel]] = (
+    WeakKeyDictionary()
+)
+"""Response model classes cloned by FastAPI, keyed by the original class."""
+
+_installed = False
+
+
+def install_cloned_types_cache() -> None:
+    """Make FastAPI reuse cloned response model classes across routes.
+
+    When a route is created, FastAPI clones its response model (and every
+    nested model) so that subclasses with extra fields aren't returned as-is.
+    Before FastAPI 0.96, each clone starts from an empty cache and therefore
+    re-creates the same model classes for every route. This installs a
+    process-wide cache, like the one added in FastAPI 0.96, and does nothing
+    on FastAPI versions that already have it.
+
+    This must be called before any routes are created.
+    """
+    global _installed
+
+    if _installed or hasattr(fastapi.utils, "_CLONED_TYPES_CACHE"):
+        return
+
+    original_create_cloned_field = fastapi.utils.create_cloned_field
+
+    def create_cloned_field(
+        field: ModelField,
+        *,
+        cloned_types: Optional[Dict[Type[BaseModel], Type[BaseModel]]] = None,
+    ) -> ModelField:
+        if cloned_types is None:
+            cloned_types = cast(
+                Dict[Type[BaseModel], Type[BaseModel]], _cloned_types
+            )
+        return original_create_cloned_field(field, cloned_types=cloned_types)
+
+    # fastapi.routing imports create_cloned_field by name, so patch both
+    fastapi.utils.create_cloned_field = create_cloned_field
+    fastapi.routing.create_cloned_field = create_cloned_field
+    _installed = True
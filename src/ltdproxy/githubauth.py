@@ -2,27 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from enum import Enum
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
+    AbstractSet,
     Any,
+    Callable,
     Dict,
+    FrozenSet,
     List,
     Optional,
     Pattern,
-    Set,
+    Sequence,
     Tuple,
     TypeVar,
 )
 
 import gidgethub.httpx
-import yaml
 from authlib.integrations.starlette_client import OAuth, StarletteOAuth2App
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from structlog import get_logger
 
 from ltdproxy.config import config
+from ltdproxy.logutils import is_debug_enabled
+from ltdproxy.patterns import combine_patterns, match_index
+from ltdproxy.yamlutils import load_yaml
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -49,14 +56,21 @@ class GitHubOAuth:
     The instance of this class, ``github_oauth_dependency`` is a FastAPI
     path operation dependency that provides the configured OAuth instance
     to endpoint handlers.
+
+    Parameters
+    ----------
+    client_id : `str`
+        The GitHub OAuth app's client ID.
+    client_secret : `str`
+        The GitHub OAuth app's client secret, as a plain string.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, client_id: str, client_secret: str) -> None:
         self.oauth = OAuth()
         self.oauth.register(
             name="github",
-            client_id=config.github_oauth_client_id,
-            client_secret=config.github_oauth_client_secret.get_secret_value(),
+            client_id=client_id,
+            client_secret=client_secret,
             access_token_url="https://github.com/login/oauth/access_token",
             access_token_params=None,
             authorize_url="https://github.com/login/oauth/authorize",
@@ -71,7 +85,10 @@ class GitHubOAuth:
         return self.oauth.github
 
 
-github_oauth_dependency = GitHubOAuth()
+github_oauth_dependency = GitHubOAuth(
+    client_id=config.github_oauth_client_id,
+    client_secret=config.github_oauth_client_secret.get_secret_value(),
+)
 """Path dependency that returns a configured
 `authlib.integrations.starlette_client.OAuth` instance for GitHub OAuth.
 """
@@ -83,8 +100,11 @@ async def set_serialized_github_memberships(
     session: Dict[Any, Any],
     github_token: str,
 ) -> None:
-    """Add JSON-serialized GitHub organization and team memberships to the
-    request session.
+    """Add GitHub organization and team memberships to the request session.
+
+    The memberships are stored as a JSON-compatible mapping, with ``orgs``
+    and ``teams`` keys, since the session middleware already serializes the
+    session to JSON for the cookie.
     """
     # These orgs and teams are mentioned in the GitHub Auth configuration,
     # and therefore are ones to pay attention to in the cookie.
@@ -96,29 +116,56 @@ async def set_serialized_github_memberships(
         http_client, "ltd-proxy", oauth_token=github_token
     )
 
-    # Get all relevant organization memberships for the user
+    # The organization and team listings are independent, so request them
+    # concurrently.
+    user_orgs, user_teams = await asyncio.gather(
+        _get_user_orgs(github_client, relevant_orgs),
+        _get_user_teams(github_client, relevant_orgs),
+    )
+
+    logger.debug("GitHub user memberships", orgs=user_orgs, teams=user_teams)
+    session["github_memberships"] = {"orgs": user_orgs, "teams": user_teams}
+
+
+# GitHub returns 30 items per page by default; the functions below request
+# the maximum page size to reduce the number of sequential requests during
+# login.
+
+
+async def _get_user_orgs(
+    github_client: gidgethub.httpx.GitHubAPI, relevant_orgs: AbstractSet[str]
+) -> List[str]:
+    """Get the user's memberships in the relevant organizations."""
     user_orgs: List[str] = []
-    async for org in github_client.getiter("/user/memberships/orgs"):
+    async for org in github_client.getiter(
+        "/user/memberships/orgs{?per_page}", url_vars={"per_page": "100"}
+    ):
         if org["organization"]["login"] in relevant_orgs:
             user_orgs.append(org["organization"]["login"])
+    return user_orgs
 
-    # Get all relevant team memberships for the user
+
+async def _get_user_teams(
+    github_client: gidgethub.httpx.GitHubAPI, relevant_orgs: AbstractSet[str]
+) -> List[Tuple[str, str]]:
+    """Get the user's team memberships in the relevant organizations."""
     user_teams: List[Tuple[str, str]] = []
-    async for team in github_client.getiter("/user/teams"):
+    async for team in github_client.getiter(
+        "/user/teams{?per_page}", url_vars={"per_page": "100"}
+    ):
         team_id = (team["organization"]["login"], team["name"])
         if team_id[0] in relevant_orgs:
             logger.debug("Found relevant team", team=team)
             user_teams.append(team_id)
-
-    # Serialize memberships to JSON to pack inside the session cookie
-    memberships = json.dumps({"orgs": user_orgs, "teams": user_teams})
-    logger.debug("GitHub user memberships", orgs=user_orgs, teams=user_teams)
-    session["github_memberships"] = memberships
+    return user_teams
 
 
 class GitHubGroup(BaseModel):
     """A model for a GitHub group configuration, either an entire organization
     or a team within an organization.
+
+    The model is immutable because `PathRule` and `GitHubAuth` build their
+    authorization lookup tables from their groups.
     """
 
     org: str
@@ -127,6 +174,9 @@ class GitHubGroup(BaseModel):
     team: Optional[str] = None
     """The name of a team within an organization."""
 
+    class Config:
+        allow_mutation = False
+
     @property
     def is_team(self) -> bool:
         if self.team:
@@ -135,17 +185,60 @@ class GitHubGroup(BaseModel):
             return False
 
 
+def _collect_orgs_and_teams(
+    groups: Sequence[GitHubGroup],
+) -> Tuple[FrozenSet[str], FrozenSet[Tuple[str, str]]]:
+    """Split GitHub groups into sets of organizations and
+    ``(org, team)`` tuples.
+    """
+    orgs = frozenset(group.org for group in groups if not group.team)
+    teams = frozenset(
+        (group.org, group.team) for group in groups if group.team
+    )
+    return orgs, teams
+
+
 class PathRule(BaseModel):
-    """A model for a URL path and authorized entities."""
+    """A model for a URL path and authorized entities.
+
+    The model is immutable because `authorized_orgs` and `authorized_teams`
+    are precomputed from ``authorized`` when the rule is created.
+    """
 
     pattern: Pattern
     """Regular expression pattern that matches a path."""
 
-    authorized: List[GitHubGroup]
+    authorized: Tuple[GitHubGroup, ...]
     """A list fo GitHub groups (teams and/or organizations) that are
     authorized to access this path.
     """
 
+    class Config:
+        allow_mutation = False
+
+    _authorized_orgs: FrozenSet[str] = PrivateAttr(frozenset())
+
+    _authorized_teams: FrozenSet[Tuple[str, str]] = PrivateAttr(frozenset())
+
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**data)
+        (
+            self._authorized_orgs,
+            self._authorized_teams,
+        ) = _collect_orgs_and_teams(self.authorized)
+
+    @property
+    def authorized_orgs(self) -> FrozenSet[str]:
+        """Organizations whose members are authorized for this path."""
+        return self._authorized_orgs
+
+    @property
+    def authorized_teams(self) -> FrozenSet[Tuple[str, str]]:
+        """Teams, as ``(org, team)`` tuples, whose members are authorized
+        for this path.
+        """
+        return self._authorized_teams
+
     def path_matches(self, url_path: str) -> bool:
         """Test if a URL path matches the rule's patten."""
         if self.pattern.match(url_path):
@@ -159,24 +252,21 @@ class PathRule(BaseModel):
             return False
 
     def is_user_authorized(
-        self, *, user_orgs: List[str], user_teams: List[Tuple[str, str]]
+        self,
+        *,
+        user_orgs: AbstractSet[str],
+        user_teams: AbstractSet[Tuple[str, str]],
     ) -> bool:
         """Test if a user is authorized for this path.
 
         The parameters come from the ``github_memberships`` attribute of
         the session cookie, after parsing from JSON.
         """
-        for authorized_group in self.authorized:
-            if authorized_group.is_team:
-                authorized_team_id = (
-                    authorized_group.org,
-                    authorized_group.team,
-                )
-                if authorized_team_id in user_teams:
-                    return True
-            else:
-                if authorized_group.org in user_orgs:
-                    return True
+        if not (
+            self._authorized_orgs.isdisjoint(user_orgs)
+            and self._authorized_teams.isdisjoint(user_teams)
+        ):
+            return True
 
         # no matches
         logger.debug(
@@ -199,49 +289,126 @@ class AuthResult(str, Enum):
 class GitHubAuth(BaseModel):
     """A model for the GitHubAuth configuration file, with methods for
     determining if a requester is authorized to view a given path.
+
+    The model is immutable because the combined path pattern, the group
+    lookup tables, and the authorization cache are built from ``default``
+    and ``paths`` when the model is created.
     """
 
-    default: List[GitHubGroup]
+    default: Tuple[GitHubGroup, ...]
     """Default authorized groups if a path does not match."""
 
-    paths: List[PathRule]
+    paths: Tuple[PathRule, ...]
     """A list of path expressions and the groups that are authorized to
     access those paths.
     """
 
+    class Config:
+        allow_mutation = False
+
+    _paths_pattern: Optional[Pattern] = PrivateAttr(None)
+    """The patterns of all path rules, combined into one expression."""
+
+    _default_orgs: FrozenSet[str] = PrivateAttr(frozenset())
+
+    _default_teams: FrozenSet[Tuple[str, str]] = PrivateAttr(frozenset())
+
+    _relevant_orgs: FrozenSet[str] = PrivateAttr(frozenset())
+
+    _relevant_teams: FrozenSet[Tuple[str, str]] = PrivateAttr(frozenset())
+
+    _is_authorized_cached: Callable[
+        [str, FrozenSet[str], FrozenSet[Tuple[str, str]]], bool
+    ] = PrivateAttr()
+    """A memoized version of `is_user_authorized` taking positional
+    arguments, for use by `is_session_authorized`.
+    """
+
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**data)
+        self._paths_pattern = combine_patterns(
+            [path_rule.pattern for path_rule in self.paths]
+        )
+        (
+            self._default_orgs,
+            self._default_teams,
+        ) = _collect_orgs_and_teams(self.default)
+
+        all_groups = list(self.default)
+        for path_rule in self.paths:
+            all_groups.extend(path_rule.authorized)
+        self._relevant_orgs = frozenset(
+            github_group.org for github_group in all_groups
+        )
+        self._relevant_teams = frozenset(
+            (github_group.org, github_group.team)
+            for github_group in all_groups
+            if github_group.team
+        )
+
+        # The cache belongs to this instance, so reloading the configuration
+        # (creating a new GitHubAuth) also resets it.
+        self._is_authorized_cached = lru_cache(maxsize=4096)(
+            self._is_authorized
+        )
+
     @classmethod
     def parse_yaml(cls, path: Path) -> GitHubAuth:
         """Parse the YAML representation of this configuration model."""
-        data = yaml.safe_load(path.read_text())
+        data = load_yaml(path)
         return cls.parse_obj(data)
 
     def is_user_authorized(
         self,
         *,
         url_path: str,
-        user_orgs: List[str],
-        user_teams: List[Tuple[str, str]],
+        user_orgs: AbstractSet[str],
+        user_teams: AbstractSet[Tuple[str, str]],
     ) -> bool:
-        for path_rule in self.paths:
-            if path_rule.path_matches(url_path):
-                if path_rule.is_user_authorized(
-                    user_orgs=user_orgs, user_teams=user_teams
-                ):
-                    return True
-                else:
-                    return False
+        path_rule = self.match_path_rule(url_path)
+        if path_rule is not None:
+            if path_rule.is_user_authorized(
+                user_orgs=user_orgs, user_teams=user_teams
+            ):
+                return True
+            else:
+                return False
 
         # Fallback to the default authorizations
-        for authed_group in self.default:
-            if authed_group.is_team:
-                authorized_team_id = (authed_group.org, authed_group.team)
-                if authorized_team_id in user_teams:
-                    return True
-            else:
-                if authed_group.org in user_orgs:
-                    return True
+        return not (
+            self._default_orgs.isdisjoint(user_orgs)
+            and self._default_teams.isdisjoint(user_teams)
+        )
 
-        return False
+    def _is_authorized(
+        self,
+        url_path: str,
+        user_orgs: FrozenSet[str],
+        user_teams: FrozenSet[Tuple[str, str]],
+    ) -> bool:
+        return self.is_user_authorized(
+            url_path=url_path, user_orgs=user_orgs, user_teams=user_teams
+        )
+
+    def match_path_rule(self, url_path: str) -> Optional[PathRule]:
+        """Get the first path rule that matches a URL path, if any."""
+        if self._paths_pattern is None:
+            for path_rule in self.paths:
+                if path_rule.path_matches(url_path):
+                    return path_rule
+            return None
+
+        index = match_index(self._paths_pattern, url_path)
+        if index is None:
+            return None
+        path_rule = self.paths[index]
+        if is_debug_enabled():
+            logger.debug(
+                "Path matches PathRule",
+                pattern=path_rule.pattern,
+                url_path=url_path,
+            )
+        return path_rule
 
     def is_session_authorized(
         self, *, path: str, session: Dict[Any, Any]
@@ -251,50 +418,31 @@ class GitHubAuth(BaseModel):
         except KeyError:
             return AuthResult.unauthenticated
 
-        parsed_memberships = json.loads(github_memberships_data)
-        user_orgs = parsed_memberships["orgs"]
+        if isinstance(github_memberships_data, str):
+            # Sessions created by earlier versions store the memberships as a
+            # JSON-encoded string.
+            parsed_memberships = json.loads(github_memberships_data)
+        else:
+            parsed_memberships = github_memberships_data
+        user_orgs = frozenset(str(org) for org in parsed_memberships["orgs"])
         # This typechecks/validates the teams data structure
-        user_teams = [
+        user_teams = frozenset(
             (str(t[0]), str(t[1])) for t in parsed_memberships["teams"]
-        ]
-        if self.is_user_authorized(
-            url_path=path, user_orgs=user_orgs, user_teams=user_teams
-        ):
+        )
+        if self._is_authorized_cached(path, user_orgs, user_teams):
             return AuthResult.authorized
         else:
             return AuthResult.unauthorized
 
     @property
-    def relevant_orgs(self) -> Set[str]:
-        """Get all GitHub organizations mentioned in the configuration."""
-        all_orgs: Set[str] = set()
-
-        for github_group in self.default:
-            all_orgs.add(github_group.org)
-
-        for path_rule in self.paths:
-            for github_group in path_rule.authorized:
-                all_orgs.add(github_group.org)
-
-        return all_orgs
+    def relevant_orgs(self) -> FrozenSet[str]:
+        """All GitHub organizations mentioned in the configuration."""
+        return self._relevant_orgs
 
     @property
-    def relevant_teams(self) -> Set[Tuple[str, str]]:
-        """Get all GitHub teams mentioned in the configuration."""
-        all_teams: Set[Tuple[str, str]] = set()
-
-        for github_group in self.default:
-            if github_group.is_team:
-                assert isinstance(github_group.team, str)  # mypy cue
-                all_teams.add((github_group.org, github_group.team))
-
-        for path_rule in self.paths:
-            for github_group in path_rule.authorized:
-                if github_group.is_team:
-                    assert isinstance(github_group.team, str)  # mypy cue
-                    all_teams.add((github_group.org, github_group.team))
-
-        return all_teams
+    def relevant_teams(self) -> FrozenSet[Tuple[str, str]]:
+        """All GitHub teams mentioned in the configuration."""
+        return self._relevant_teams
 
 
 github_auth = GitHubAuth.parse_yaml(config.github_auth_config_path)
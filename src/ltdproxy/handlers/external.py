@@ -1,19 +1,20 @@
 """Handlers for the app's external root, ``/ltdproxy/``."""
 
 import posixpath
-from typing import Optional, Union
-from urllib.parse import urlencode, urlparse
+from types import MappingProxyType
+from typing import Mapping, Optional, Union
+from urllib.parse import quote, urlparse
 
 import httpx
 from authlib.integrations.starlette_client import OAuthError
 from fastapi import APIRouter, Depends, HTTPException
-from safir.dependencies.http_client import http_client_dependency
+from fastapi.responses import ORJSONResponse
 from safir.dependencies.logger import logger_dependency
-from starlette.background import BackgroundTask
 from starlette.requests import Request
 from starlette.responses import (
     HTMLResponse,
     RedirectResponse,
+    Response,
     StreamingResponse,
 )
 from structlog.stdlib import BoundLogger
@@ -27,15 +28,39 @@ from ltdproxy.githubauth import (
     github_oauth_dependency,
     set_serialized_github_memberships,
 )
+from ltdproxy.httpclient import http_client_dependency
+from ltdproxy.logutils import is_debug_enabled
 from ltdproxy.rewrites import RewriteEngine, rewrite_dependency
 from ltdproxy.s3 import Bucket, bucket_dependency
-from ltdproxy.urlmap import map_s3_path
+from ltdproxy.streaming import build_streaming_response
+from ltdproxy.urlmap import create_s3_path_mapper
 
 __all__ = ["get_s3", "external_router"]
 
-external_router = APIRouter()
+external_router = APIRouter(default_response_class=ORJSONResponse)
 """FastAPI router for all external handlers."""
 
+_map_s3_path = create_s3_path_mapper(config.s3_bucket_prefix)
+"""Map a request path to an S3 bucket key with the configured bucket
+prefix, which is read once rather than for each proxied request.
+"""
+
+_CONTENT_TYPES: Mapping[str, str] = MappingProxyType(
+    {
+        ".html": "text/html",
+        ".css": "text/css",
+        ".js": "application/javascript",
+        ".pdf": "application/pdf",
+        ".png": "image/png",
+    }
+)
+"""Content types that override the S3 object's stored content type, keyed
+by the (lowercase) file extension of the object's key.
+"""
+
+_LOGGED_OUT_BODY = b"<h1>You're logged out.</h1>"
+"""The pre-encoded body of the logged-out page."""
+
 
 @external_router.get("/auth", name="get_oauth_callback", response_model=None)
 async def get_oauth_callback(
@@ -51,7 +76,9 @@ async def get_oauth_callback(
         return HTMLResponse(f"<h1>{error.error}</h1>")
     github_token = token.get("access_token")
     logger.debug(
-        "Got github oauth token", token=token, access_token=github_token
+        "Got github oauth token",
+        token_type=token.get("token_type"),
+        scope=token.get("scope"),
     )
     if github_token:
         request.session["github_token"] = github_token
@@ -88,10 +115,9 @@ async def get_login(
         # Make sure return return url is in same domain as this request
         # (i.e., only redirect when on same site)
         if urlparse(ref).netloc == request.url.netloc:
+            separator = "&" if "?" in redirect_uri else "?"
             redirect_uri = (
-                urlparse(redirect_uri)
-                ._replace(query=urlencode({"ref": ref}, doseq=True))
-                .geturl()
+                f"{redirect_uri}{separator}ref={quote(ref, safe='')}"
             )
 
     logger.debug("Redirecting to GitHub auth", callback_url=redirect_uri)
@@ -116,7 +142,7 @@ async def get_logged_out(
     if "github_memberships" in request.session:
         # Not actually logged out yet so redirect to /logout first
         return RedirectResponse(url=request.url_for("logout"))
-    return HTMLResponse("<h1>You're logged out.</h1>")
+    return HTMLResponse(_LOGGED_OUT_BODY)
 
 
 @external_router.get(
@@ -133,56 +159,50 @@ async def get_s3(
     http_client: httpx.AsyncClient = Depends(http_client_dependency),
     github_auth: GitHubAuth = Depends(github_auth_dependency),
     rewrite_engine: RewriteEngine = Depends(rewrite_dependency),
-) -> Union[StreamingResponse, RedirectResponse]:
+) -> Union[Response, StreamingResponse, RedirectResponse]:
     """The S3 proxy endpoint."""
+    # The path parameter has no leading slash; auth and rewrite rules match
+    # the full URL path.
+    full_path = "/" + path
     github_auth_result = github_auth.is_session_authorized(
-        path=f"/{path}", session=request.session
+        path=full_path, session=request.session
     )
 
-    if github_auth_result == AuthResult.unauthenticated:
-        # User is not authenticated so redirect to the login page with
-        # this page's URL as the ref query string so they'll get redirect
-        # back here after login.
-        login_url = request.url_for("login")
-        ref_qs = urlencode({"ref": request.url}, doseq=True)
-        login_url = urlparse(login_url)._replace(query=ref_qs).geturl()
-        return RedirectResponse(url=login_url)
-
-    elif github_auth_result == AuthResult.unauthorized:
-        # User is not authorized.
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    elif github_auth_result == AuthResult.authorized:
+    if github_auth_result is AuthResult.authorized:
         # User is authorized; first check rewrites
-        response = await rewrite_engine.build_response(f"/{path}")
-        if response:
-            return response
+        if not rewrite_engine.empty:
+            response = await rewrite_engine.build_response(full_path)
+            if response:
+                return response
 
         # User is authorized; stream from S3.
-        bucket_path = map_s3_path(config.s3_bucket_prefix, path)
-        logger.debug(
-            "computed bucket path",
-            bucket_path=bucket_path,
-            request_url=str(request.url),
-        )
+        # Check the log level once so that debug log entries don't build
+        # their arguments (or run the log processors) otherwise.
+        debug = is_debug_enabled()
+        bucket_path = _map_s3_path(path)
+        if debug:
+            logger.debug(
+                "computed bucket path",
+                bucket_path=bucket_path,
+                request_url=str(request.url),
+            )
         stream = await bucket.stream_object(http_client, bucket_path)
         if stream.status_code == 404:
+            await stream.aclose()
             if not path.endswith("/") and posixpath.splitext(path)[1] == "":
                 # try a redirect; not sure this is relevant with directory
                 # redirect objects
-                parsed_url = urlparse(str(request.url))
-                parsed_url = parsed_url._replace(path=f"{parsed_url.path}/")
-                return RedirectResponse(url=parsed_url.geturl())
+                return RedirectResponse(url=_add_trailing_slash(request))
             else:
                 raise HTTPException(status_code=404, detail="Does not exist.")
-        logger.debug("stream headers", headers=stream.headers)
+        if debug:
+            logger.debug("stream headers", headers=dict(stream.headers))
 
         # Check if it's an LTD directory redirect object with a
         # x-amz-meta-dir-redirect header:
         if stream.headers.get("x-amz-meta-dir-redirect", "false") == "true":
-            parsed_url = urlparse(str(request.url))
-            parsed_url = parsed_url._replace(path=f"{parsed_url.path}/")
-            return RedirectResponse(url=parsed_url.geturl())
+            await stream.aclose()
+            return RedirectResponse(url=_add_trailing_slash(request))
 
         response_headers = {
             "Content-type": stream.headers["Content-type"],
@@ -190,32 +210,43 @@ async def get_s3(
             "Etag": stream.headers["Etag"],
         }
         # FIXME hack to override content-type headers
-        if bucket_path.endswith(".html"):
-            logger.debug("is html")
-            response_headers["Content-type"] = "text/html"
-        elif bucket_path.endswith(".css"):
-            logger.debug("is css")
-            response_headers["Content-type"] = "text/css"
-        elif bucket_path.endswith(".js"):
-            logger.debug("is js")
-            response_headers["Content-type"] = "application/javascript"
-        elif bucket_path.endswith(".pdf"):
-            logger.debug("is pdf")
-            response_headers["Content-type"] = "application/pdf"
-        elif bucket_path.endswith(".png"):
-            logger.debug("is png")
-            response_headers["Content-type"] = "image/png"
-        else:
-            logger.debug("did not change response content-type")
-
-        logger.debug("response headers", headers=response_headers)
-
-        return StreamingResponse(
-            stream.aiter_raw(),
-            background=BackgroundTask(stream.aclose),
-            headers=response_headers,
+        content_type = _CONTENT_TYPES.get(
+            posixpath.splitext(bucket_path)[1].lower()
         )
+        if content_type is not None:
+            response_headers["Content-type"] = content_type
+        if debug:
+            logger.debug(
+                "response headers",
+                headers=response_headers,
+                content_type_overridden=content_type is not None,
+            )
+
+        return build_streaming_response(stream, headers=response_headers)
+
+    elif github_auth_result is AuthResult.unauthenticated:
+        # User is not authenticated so redirect to the login page with
+        # this page's URL as the ref query string so they'll get redirect
+        # back here after login.
+        # The login URL has no query string of its own, so the ref
+        # parameter can be appended directly.
+        login_url = request.url_for("login")
+        ref = quote(str(request.url), safe="")
+        return RedirectResponse(url=f"{login_url}?ref={ref}")
+
+    elif github_auth_result is AuthResult.unauthorized:
+        # User is not authorized.
+        raise HTTPException(status_code=403, detail="Not authorized")
 
     else:
         # Catch-all error
         raise HTTPException(status_code=500, detail="Internal auth error")
+
+
+def _add_trailing_slash(request: Request) -> str:
+    """Get the request's URL with a trailing slash added to the path.
+
+    This reuses the request URL's already-split components rather than
+    re-parsing the URL string.
+    """
+    return str(request.url.replace(path=f"{request.url.path}/"))
@@ -2,18 +2,29 @@
 
 import httpx
 from fastapi import APIRouter, Depends
-from safir.dependencies.http_client import http_client_dependency
+from fastapi.responses import ORJSONResponse
 from safir.dependencies.logger import logger_dependency
 from starlette.responses import PlainTextResponse
 from structlog.stdlib import BoundLogger
 
 from ltdproxy.config import config
+from ltdproxy.httpclient import http_client_dependency
 from ltdproxy.s3 import Bucket, bucket_dependency
 
-health_router = APIRouter()
+health_router = APIRouter(default_response_class=ORJSONResponse)
 
+_OK_BODY = b"OK"
+"""The health check response body, pre-encoded.
 
-@health_router.get("/__healthz", name="healthz")
+Responses are still created per request: middleware (such as the session
+middleware) modifies a response's headers in place, so a shared response
+instance would leak headers between requests.
+"""
+
+
+@health_router.get(
+    "/__healthz", name="healthz", response_class=PlainTextResponse
+)
 async def healthy(
     bucket: Bucket = Depends(bucket_dependency),
     logger: BoundLogger = Depends(logger_dependency),
@@ -30,8 +41,10 @@ async def healthy(
                 status_code=stream.status_code,
             )
             return PlainTextResponse("ERROR", status_code=500)
-        async for _ in stream.aiter_bytes():
+        # Drain the body to exercise streaming, without decoding or
+        # re-chunking the reads
+        async for _ in stream.aiter_raw():
             pass
         await stream.aclose()
 
-    return PlainTextResponse("OK", status_code=200)
+    return PlainTextResponse(_OK_BODY, status_code=200)
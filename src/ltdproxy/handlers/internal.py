@@ -9,13 +9,14 @@ or other information that should not be visible outside the Kubernetes cluster.
 """
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from safir.metadata import Metadata, get_metadata
 
 from ..config import config
 
 __all__ = ["get_index", "internal_router"]
 
-internal_router = APIRouter()
+internal_router = APIRouter(default_response_class=ORJSONResponse)
 """FastAPI router for all internal handlers."""
 
 
@@ -0,0 +1,86 @@
+"""The shared HTTP client for outbound requests to S3, GitHub, and rewrite
+backends.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import httpx
+
+__all__ = [
+    "HTTP_TIMEOUT",
+    "HTTP_LIMITS",
+    "HTTPClientDependency",
+    "http_client_dependency",
+    "rewrite_http_client_dependency",
+]
+
+HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0)
+"""Timeouts (in seconds) for outbound HTTP requests.
+
+Connecting and waiting for a pooled connection fail fast, while the read
+timeout leaves room for slow upstream responses (including GitHub's
+authorization APIs).
+"""
+
+HTTP_LIMITS = httpx.Limits(
+    max_connections=1000, max_keepalive_connections=200, keepalive_expiry=75.0
+)
+"""Connection pool limits for the shared HTTP client.
+
+The proxy streams many concurrent responses from a small number of hosts
+(the S3 endpoint and the rewrite backends). The httpx defaults (100
+connections, 20 kept alive for 5 seconds) make concurrent requests queue for
+a connection and re-open TLS connections between bursts of traffic.
+"""
+
+
+class HTTPClientDependency:
+    """Provides a shared ``httpx.AsyncClient`` as a FastAPI dependency.
+
+    The client has redirects enabled, the timeouts in `HTTP_TIMEOUT`, and the
+    connection pool limits in `HTTP_LIMITS`.
+
+    Parameters
+    ----------
+    http2 : `bool`
+        Whether the client negotiates HTTP/2 with servers that support it.
+
+    Notes
+    -----
+    The application must call the dependency's ``aclose()`` method as part of
+    a shutdown hook.
+    """
+
+    def __init__(self, *, http2: bool = False) -> None:
+        self.http2 = http2
+        self.http_client: Optional[httpx.AsyncClient] = None
+
+    async def __call__(self) -> httpx.AsyncClient:
+        """Return the cached ``httpx.AsyncClient``."""
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT,
+                limits=HTTP_LIMITS,
+                http2=self.http2,
+                follow_redirects=True,
+            )
+        return self.http_client
+
+    async def aclose(self) -> None:
+        """Close the ``httpx.AsyncClient``."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
+
+http_client_dependency = HTTPClientDependency()
+"""The dependency that returns the shared HTTP/1.1 client for requests to S3
+(which doesn't support HTTP/2) and GitHub.
+"""
+
+rewrite_http_client_dependency = HTTPClientDependency(http2=True)
+"""The dependency that returns the shared HTTP client for the rewrite
+backends, which multiplexes requests over HTTP/2 where a backend supports it.
+"""
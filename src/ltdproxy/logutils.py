@@ -0,0 +1,19 @@
+"""Logging utilities."""
+
+from __future__ import annotations
+
+import logging
+
+from ltdproxy.config import config
+
+__all__ = ["is_debug_enabled"]
+
+
+def is_debug_enabled() -> bool:
+    """Whether the application's logger emits debug messages.
+
+    This checks the standard library logger that structlog writes through
+    (the structlog proxy itself has no ``isEnabledFor`` until logging is
+    configured), so it can guard building expensive debug log arguments.
+    """
+    return logging.getLogger(config.logger_name).isEnabledFor(logging.DEBUG)
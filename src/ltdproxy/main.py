@@ -9,7 +9,7 @@ called.
 
 import structlog
 from fastapi import FastAPI
-from safir.dependencies.http_client import http_client_dependency
+from fastapi.responses import ORJSONResponse
 from safir.logging import configure_logging
 from safir.metadata import get_metadata
 from safir.middleware.x_forwarded import XForwardedMiddleware
@@ -17,6 +17,7 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from .appsetup import add_handlers
 from .config import config
+from .httpclient import http_client_dependency, rewrite_http_client_dependency
 from .rewrites import rewrite_dependency
 
 __all__ = ["app", "config"]
@@ -27,7 +28,7 @@ configure_logging(
     name=config.logger_name,
 )
 
-app = FastAPI(openapi_url=None)
+app = FastAPI(openapi_url=None, default_response_class=ORJSONResponse)
 """The main FastAPI application for ltd-proxy."""
 
 add_handlers(app=app, config=config)
@@ -46,9 +47,10 @@ async def startup_event() -> None:
         application_name=config.name,
     )
     logger.info("Starting up", version=metadata.version)
-    await rewrite_dependency.initialize(await http_client_dependency())
+    await rewrite_dependency.initialize(await rewrite_http_client_dependency())
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     await http_client_dependency.aclose()
+    await rewrite_http_client_dependency.aclose()
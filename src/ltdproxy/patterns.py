@@ -0,0 +1,57 @@
+"""Helpers for matching a path against an ordered list of regular
+expressions.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional, Pattern, Sequence
+
+__all__ = ["combine_patterns", "match_index"]
+
+
+def combine_patterns(patterns: Sequence[Pattern]) -> Optional[Pattern]:
+    """Combine patterns into a single alternation with a named group for
+    each pattern.
+
+    Matching the combined pattern tries each pattern in order, so the
+    ``lastgroup`` of a match identifies the first pattern that matches. Use
+    `match_index` to get that pattern's index.
+
+    Returns
+    -------
+    pattern
+        The combined pattern, or `None` if the patterns can't be combined
+        without changing their behavior. This happens if there are no
+        patterns, a pattern has its own capturing groups (backreference
+        numbering would change), the patterns have different flags, or the
+        combined expression doesn't compile (for example, because of inline
+        global flags). Callers should then match each pattern in turn.
+    """
+    if len(patterns) == 0:
+        return None
+    flags = patterns[0].flags
+    for pattern in patterns:
+        if pattern.groups > 0 or pattern.flags != flags:
+            return None
+    try:
+        return re.compile(
+            "|".join(
+                f"(?P<_p{i}>{pattern.pattern})"
+                for i, pattern in enumerate(patterns)
+            ),
+            flags,
+        )
+    except re.error:
+        return None
+
+
+def match_index(pattern: Pattern, path: str) -> Optional[int]:
+    """Get the index of the first pattern in a combined pattern (from
+    `combine_patterns`) that matches the start of the path, or `None` if no
+    pattern matches.
+    """
+    m = pattern.match(path)
+    if m is None or m.lastgroup is None:
+        return None
+    return int(m.lastgroup[2:])
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Dict, Tuple
 
 from aws_request_signer import AwsRequestSigner
 
@@ -11,6 +12,16 @@ from .config import config
 if TYPE_CHECKING:
     import httpx
 
+SIGNATURE_TTL = 240.0
+"""Time, in seconds, that signed request headers are reused for.
+
+S3 accepts a signed request for up to 15 minutes after the signature's
+timestamp, so reusing a signature for a few minutes is safe.
+"""
+
+SIGNATURE_CACHE_SIZE = 1024
+"""Maximum number of object keys whose signed headers are cached."""
+
 
 class Bucket:
     """Interface for an S3 bucket.
@@ -32,17 +43,41 @@ class Bucket:
         self.region = region
         self.access_key_id = access_key_id
         self.secret_access_key = secret_access_key
+        # The signer only holds the credentials, so one instance can sign
+        # any number of concurrent requests.
+        self._signer = AwsRequestSigner(
+            region, access_key_id, secret_access_key, "s3"
+        )
+        self._url_base = f"https://{bucket}.s3.{region}.amazonaws.com/"
+        # Signed headers and the (monotonic) time they were signed, keyed by
+        # URL. Entries are kept in the order they were signed.
+        self._signed_headers: Dict[str, Tuple[float, Dict[str, str]]] = {}
 
     def build_request(
         self, http_client: httpx.AsyncClient, key: str
     ) -> httpx.Request:
-        url = f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
-        signer = AwsRequestSigner(
-            self.region, self.access_key_id, self.secret_access_key, "s3"
-        )
-        headers = signer.sign_with_headers("GET", url)
+        url = self._url_base + key
+        headers = self._sign_headers(url)
         return http_client.build_request("GET", url, headers=headers)
 
+    def _sign_headers(self, url: str) -> Dict[str, str]:
+        """Get the authorization headers for a GET request, reusing headers
+        signed in the last `SIGNATURE_TTL` seconds.
+        """
+        now = time.monotonic()
+        cached = self._signed_headers.get(url)
+        if cached is not None and now - cached[0] < SIGNATURE_TTL:
+            return cached[1]
+
+        headers = self._signer.sign_with_headers("GET", url)
+        # Remove any expired entry so the new one is re-inserted at the end
+        self._signed_headers.pop(url, None)
+        if len(self._signed_headers) >= SIGNATURE_CACHE_SIZE:
+            # Evict the oldest signature
+            del self._signed_headers[next(iter(self._signed_headers))]
+        self._signed_headers[url] = (now, headers)
+        return headers
+
     async def get_object(
         self, http_client: httpx.AsyncClient, key: str
     ) -> httpx.Response:
@@ -0,0 +1,62 @@
+"""Streaming of upstream (S3 and rewrite backend) responses to clients."""
+
+from __future__ import annotations
+
+from typing import AsyncIterator, Mapping
+
+import httpx
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+
+from .config import config
+
+__all__ = ["build_streaming_response", "read_raw"]
+
+
+def build_streaming_response(
+    stream: httpx.Response, *, headers: Mapping[str, str]
+) -> StreamingResponse:
+    """Create a response that streams an upstream response's raw body.
+
+    The upstream response is closed, returning its connection to the pool,
+    once the body is sent, the client disconnects, or reading the body
+    fails.
+
+    Parameters
+    ----------
+    stream : `httpx.Response`
+        An upstream response that was sent with ``stream=True``.
+    headers : `Mapping`
+        Headers for the response to the client.
+    """
+    # Starlette runs the background task after the body is sent and also
+    # when the client disconnects, but not when the body iterator raises.
+    return StreamingResponse(
+        _iter_raw(stream),
+        background=BackgroundTask(stream.aclose),
+        headers=headers,
+    )
+
+
+async def _iter_raw(stream: httpx.Response) -> AsyncIterator[bytes]:
+    """Iterate over the raw body of an upstream response, closing it if
+    reading fails.
+    """
+    try:
+        async for chunk in stream.aiter_raw(
+            chunk_size=config.stream_chunk_size
+        ):
+            yield chunk
+    except Exception:
+        await stream.aclose()
+        raise
+
+
+async def read_raw(stream: httpx.Response) -> bytes:
+    """Read the whole raw (undecoded) body of an upstream response and close
+    it.
+    """
+    try:
+        return b"".join([chunk async for chunk in stream.aiter_raw()])
+    finally:
+        await stream.aclose()
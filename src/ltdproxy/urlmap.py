@@ -2,95 +2,79 @@
 
 from __future__ import annotations
 
-from typing import List
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-__all__ = ["map_s3_path"]
+if TYPE_CHECKING:
+    from typing import Callable
 
+__all__ = ["map_s3_path", "create_s3_path_mapper"]
 
+
+@lru_cache(maxsize=8192)
 def map_s3_path(bucket_prefix: str, request_path: str) -> str:
-    """Map a request URL to an S3 bucket key."""
+    """Map a request URL to an S3 bucket key.
+
+    Results are cached since documentation sites get repeated requests for
+    the same pages and assets.
+    """
     # decompose the path into the project and whether it is a /v/ edition or
     # not
-    path_parts = create_bucket_path(request_path)
+    bucket_path = create_bucket_path(request_path)
     if bucket_prefix:
-        print("inserting bucket prefix")
-        path_parts.insert(0, bucket_prefix)
-    else:
-        print(f"No bucket prefix: {bucket_prefix}.")
-
-    bucket_path = "/".join(path_parts)
-    bucket_path = bucket_path.rstrip("/")  # happens if edition_path is ""
-
+        return f"{bucket_prefix}/{bucket_path}"
     return bucket_path
 
 
-def create_bucket_path(request_path: str) -> List[str]:
-    parts = request_path.split("/")
-    parts_count = len(parts)
-    project_name = parts[0].lower()
+def create_s3_path_mapper(bucket_prefix: str) -> Callable[[str], str]:
+    """Create a function that maps request paths to S3 bucket keys for a
+    fixed bucket prefix.
 
-    if parts_count == 1:
-        return [project_name, "v", "__main"]
-    elif parts[1].lower() == "v":
-        if parts_count == 2:
-            return [project_name, "v"]
-        elif parts_count == 3:
-            if parts[2] == "":
-                return [project_name, "v", "index.html"]
-            else:
-                return [project_name, "v", parts[2]]
-        else:
-            return create_edition_path(
-                project=project_name, edition=parts[2], path=parts[3:]
-            )
-    elif parts[1].lower() == "builds":
-        if parts_count == 2:
-            return [project_name, "builds"]
-        elif parts_count == 3:
-            if parts[2] == "":
-                return [project_name, "builds", "index.html"]
-            else:
-                return [project_name, "builds", parts[2]]
-        else:
-            return create_build_path(
-                project=project_name, build=parts[2], path=parts[3:]
-            )
-    elif parts[1] == "_dashboard-assets":
-        return parts
-    else:
-        edition_name = "__main"
-        return create_edition_path(
-            project=project_name, edition=edition_name, path=parts[1:]
-        )
+    The returned function is equivalent to `map_s3_path` with the
+    ``bucket_prefix`` argument bound, but the prefix check is done once
+    here rather than on each call, and its cache is keyed by the request
+    path alone.
+    """
+    if bucket_prefix:
 
+        def map_path(request_path: str) -> str:
+            return f"{bucket_prefix}/{create_bucket_path(request_path)}"
 
-def create_edition_path(
-    *, project: str, edition: str, path: List[str]
-) -> List[str]:
-    if path[-1] == "":
-        path_str = f'{"/".join(path)}index.html'
     else:
-        path_str = "/".join(path)
+        map_path = create_bucket_path
+    return lru_cache(maxsize=8192)(map_path)
+
 
-    return [
-        project,
-        "v",
-        edition,
-        path_str,
-    ]
+def create_bucket_path(request_path: str) -> str:
+    """Map a request path to an S3 bucket key, without the bucket prefix.
 
+    Only the first three path segments are significant, so the path is split
+    at most three times and the rest of the path is kept as a single string.
+    """
+    parts = request_path.split("/", 3)
+    parts_count = len(parts)
+    project_name = parts[0].lower()
+    if parts_count == 1:
+        return f"{project_name}/v/__main"
 
-def create_build_path(
-    *, project: str, build: str, path: List[str]
-) -> List[str]:
-    if path[-1] == "":
-        path_str = f'{"/".join(path)}index.html'
+    segment = parts[1]
+    kind = segment.lower()
+    if kind == "v" or kind == "builds":
+        if parts_count == 2:
+            return f"{project_name}/{kind}"
+        elif parts_count == 3:
+            return f"{project_name}/{kind}/{parts[2] or 'index.html'}"
+        # The edition or build name, then the path within it
+        name = parts[2]
+        path = parts[3]
+    elif segment == "_dashboard-assets":
+        return request_path.rstrip("/")
     else:
-        path_str = "/".join(path)
-
-    return [
-        project,
-        "builds",
-        build,
-        path_str,
-    ]
+        kind = "v"
+        name = "__main"
+        path = request_path[len(parts[0]) + 1 :]
+
+    # Resolve directory paths in an edition or build to their index.html
+    if path == "" or path[-1] == "/":
+        return f"{project_name}/{kind}/{name}/{path}index.html"
+    return f"{project_name}/{kind}/{name}/{path}"
@@ -0,0 +1,20 @@
+"""YAML loading utilities."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+__all__ = ["load_yaml"]
+
+_YamlSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+"""The libyaml-based safe loader, if PyYAML was built with libyaml, or else
+the pure-Python safe loader.
+"""
+
+
+def load_yaml(path: Path) -> Any:
+    """Load a YAML file with the safe loader."""
+    return yaml.load(path.read_bytes(), Loader=_YamlSafeLoader)
@@ -0,0 +1,90 @@
+"""Tests for the appsetup module."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Mount
+
+from ltdproxy.appsetup import add_handlers
+from ltdproxy.config import config
+from ltdproxy.githubauth import github_oauth_dependency
+
+
+class StubGitHubOAuth:
+    """A stand-in for the GitHub OAuth client that doesn't redirect."""
+
+    async def authorize_redirect(
+        self, request: Request, redirect_uri: str
+    ) -> PlainTextResponse:
+        return PlainTextResponse("OVERRIDDEN")
+
+
+def stub_github_oauth() -> Any:
+    return StubGitHubOAuth()
+
+
+def test_add_handlers_root_prefix() -> None:
+    app = FastAPI(openapi_url=None)
+    add_handlers(config=config.copy(update={"path_prefix": "/"}), app=app)
+
+    paths = [route.path for route in app.routes]  # type: ignore[attr-defined]
+    assert "/__healthz" in paths
+    assert "/login" in paths
+    # The catch-all proxy route must come after the other routes
+    assert paths[-1] == "/{path:path}"
+
+
+def test_add_handlers_path_prefix() -> None:
+    app = FastAPI(openapi_url=None)
+    add_handlers(
+        config=config.copy(update={"path_prefix": "/ltdproxy"}), app=app
+    )
+
+    paths = [route.path for route in app.routes]  # type: ignore[attr-defined]
+    assert "/" in paths
+    assert "/__healthz" in paths
+    assert "/login" not in paths
+
+    mount = app.routes[-1]
+    assert isinstance(mount, Mount)
+    assert mount.path == "/ltdproxy"
+    assert isinstance(mount.app, FastAPI)
+    sub_routes = mount.app.routes
+    paths = [route.path for route in sub_routes]  # type: ignore[attr-defined]
+    assert "/login" in paths
+    assert paths[-1] == "/{path:path}"
+
+
+@pytest.mark.asyncio
+async def test_dependency_overrides_root_prefix() -> None:
+    app = FastAPI(openapi_url=None)
+    add_handlers(config=config.copy(update={"path_prefix": "/"}), app=app)
+    app.dependency_overrides[github_oauth_dependency] = stub_github_oauth
+
+    async with AsyncClient(app=app, base_url="https://example.com/") as c:
+        response = await c.get("/login", params={"ref": ""})
+    assert response.status_code == 200
+    assert response.text == "OVERRIDDEN"
+
+
+@pytest.mark.asyncio
+async def test_dependency_overrides_path_prefix() -> None:
+    app = FastAPI(openapi_url=None)
+    add_handlers(
+        config=config.copy(update={"path_prefix": "/ltdproxy"}), app=app
+    )
+    mount = app.routes[-1]
+    assert isinstance(mount, Mount)
+    assert isinstance(mount.app, FastAPI)
+    mount.app.dependency_overrides[github_oauth_dependency] = stub_github_oauth
+
+    async with AsyncClient(app=app, base_url="https://example.com/") as c:
+        response = await c.get("/ltdproxy/login", params={"ref": ""})
+    assert response.status_code == 200
+    assert response.text == "OVERRIDDEN"
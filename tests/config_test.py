@@ -0,0 +1,41 @@
+"""Tests for the config module."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from ltdproxy.config import Profile, config, get_config
+
+
+def test_get_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    original_bucket = config.s3_bucket
+    assert get_config() is get_config()
+
+    monkeypatch.setenv("LTDPROXY_S3_BUCKET", "other-bucket")
+    assert config.s3_bucket == original_bucket
+    get_config.cache_clear()
+    try:
+        assert config.s3_bucket == "other-bucket"
+    finally:
+        monkeypatch.undo()
+        get_config.cache_clear()
+    assert config.s3_bucket == original_bucket
+
+
+def test_config() -> None:
+    assert isinstance(config.profile, Profile)
+
+
+@pytest.mark.parametrize("chunk_size", ["0", "-1"])
+def test_stream_chunk_size_positive(
+    monkeypatch: pytest.MonkeyPatch, chunk_size: str
+) -> None:
+    monkeypatch.setenv("LTDPROXY_STREAM_CHUNK_SIZE", chunk_size)
+    get_config.cache_clear()
+    try:
+        with pytest.raises(ValidationError):
+            get_config()
+    finally:
+        monkeypatch.undo()
+        get_config.cache_clear()
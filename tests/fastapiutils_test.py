@@ -0,0 +1,30 @@
+"""Tests for the fastapiutils module."""
+
+from __future__ import annotations
+
+from fastapi.routing import APIRoute
+from safir.metadata import Metadata
+
+from ltdproxy.fastapiutils import install_cloned_types_cache
+
+
+def test_cloned_types_cache() -> None:
+    install_cloned_types_cache()
+
+    async def endpoint() -> Metadata:
+        return Metadata(
+            name="ltd-proxy",
+            version="1.0.0",
+            description=None,
+            repository_url=None,
+            documentation_url=None,
+        )
+
+    route1 = APIRoute("/a", endpoint, response_model=Metadata)
+    route2 = APIRoute("/b", endpoint, response_model=Metadata)
+    assert route1.secure_cloned_response_field is not None
+    assert route2.secure_cloned_response_field is not None
+    cloned_type1 = route1.secure_cloned_response_field.type_
+    cloned_type2 = route2.secure_cloned_response_field.type_
+    assert cloned_type1 is not Metadata
+    assert cloned_type1 is cloned_type2
@@ -4,8 +4,19 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import Any, Dict
 
-from ltdproxy.githubauth import AuthResult, GitHubAuth, GitHubGroup, PathRule
+import httpx
+import pytest
+
+from ltdproxy.githubauth import (
+    AuthResult,
+    GitHubAuth,
+    GitHubGroup,
+    GitHubOAuth,
+    PathRule,
+    set_serialized_github_memberships,
+)
 
 
 def test_path_rule() -> None:
@@ -35,7 +46,7 @@ def test_githubauth_example_yaml() -> None:
     # Testing the default rule
     assert (
         github_auth.is_user_authorized(
-            url_path="/xyz", user_orgs=["jsickcodes"], user_teams=[]
+            url_path="/xyz", user_orgs={"jsickcodes"}, user_teams=set()
         )
         is True
     )
@@ -43,7 +54,7 @@ def test_githubauth_example_yaml() -> None:
     # Testing the default rule
     assert (
         github_auth.is_user_authorized(
-            url_path="/xyz", user_orgs=["jsickwrites"], user_teams=[]
+            url_path="/xyz", user_orgs={"jsickwrites"}, user_teams=set()
         )
         is False
     )
@@ -51,26 +62,28 @@ def test_githubauth_example_yaml() -> None:
     # Testing the path rule for /a/
     assert (
         github_auth.is_user_authorized(
-            url_path="/a/index.html", user_orgs=["jsickcodes"], user_teams=[]
+            url_path="/a/index.html",
+            user_orgs={"jsickcodes"},
+            user_teams=set(),
         )
         is False
     )
     assert (
         github_auth.is_user_authorized(
             url_path="/a/index.html",
-            user_orgs=["jsickcodes"],
-            user_teams=[("jsickcodes", "Blue Team")],
+            user_orgs={"jsickcodes"},
+            user_teams={("jsickcodes", "Blue Team")},
         )
         is False
     )
     assert (
         github_auth.is_user_authorized(
             url_path="/a/index.html",
-            user_orgs=["jsickcodes"],
-            user_teams=[
+            user_orgs={"jsickcodes"},
+            user_teams={
                 ("jsickcodes", "Red Team"),
                 ("jsickcodes", "Blue Team"),
-            ],
+            },
         )
         is True
     )
@@ -87,7 +100,7 @@ def test_githubauth_example_yaml() -> None:
             path="/xyz",
             session={
                 "github_memberships": json.dumps(
-                    {"orgs": "acompany", "teams": []}
+                    {"orgs": ["acompany"], "teams": []}
                 )
             },
         )
@@ -100,7 +113,7 @@ def test_githubauth_example_yaml() -> None:
             path="/xyz",
             session={
                 "github_memberships": json.dumps(
-                    {"orgs": "jsickcodes", "teams": []}
+                    {"orgs": ["jsickcodes"], "teams": []}
                 )
             },
         )
@@ -113,7 +126,7 @@ def test_githubauth_example_yaml() -> None:
             session={
                 "github_memberships": json.dumps(
                     {
-                        "orgs": "jsickcodes",
+                        "orgs": ["jsickcodes"],
                         "teams": [["jsickcodes", "Red Team"]],
                     }
                 )
@@ -127,9 +140,129 @@ def test_githubauth_example_yaml() -> None:
             path="/a/hello",
             session={
                 "github_memberships": json.dumps(
-                    {"orgs": "jsickcodes", "teams": []}
+                    {"orgs": ["jsickcodes"], "teams": []}
                 )
             },
         )
         is AuthResult.unauthorized
     )
+
+
+def test_match_path_rule() -> None:
+    """Test that the first matching path rule is used, whether the path rule
+    patterns are combined or matched one by one.
+    """
+    org_group = GitHubGroup(org="jsickcodes")
+    for patterns in (
+        [r"\/a\/", r"\/b\/", r"\/a\/b\/"],
+        [r"\/(a)\/", r"\/b\/", r"\/a\/b\/"],  # not combinable
+    ):
+        github_auth = GitHubAuth(
+            default=[org_group],
+            paths=[
+                {"pattern": pattern, "authorized": [org_group]}
+                for pattern in patterns
+            ],
+        )
+        rule = github_auth.match_path_rule("/a/b/index.html")
+        assert rule is github_auth.paths[0]
+        rule = github_auth.match_path_rule("/b/index.html")
+        assert rule is github_auth.paths[1]
+        assert github_auth.match_path_rule("/c/index.html") is None
+
+
+def test_is_session_authorized_memberships_mapping() -> None:
+    """Test is_session_authorized with memberships stored as a mapping, as
+    set by set_serialized_github_memberships.
+    """
+    example_path = Path(__file__).parent / "githubauth.example.yaml"
+    github_auth = GitHubAuth.parse_yaml(example_path)
+
+    session = {
+        "github_memberships": {
+            "orgs": ["jsickcodes"],
+            "teams": [["jsickcodes", "Red Team"]],
+        }
+    }
+    assert (
+        github_auth.is_session_authorized(path="/a/hello", session=session)
+        is AuthResult.authorized
+    )
+    assert (
+        github_auth.is_session_authorized(path="/b/hello", session=session)
+        is AuthResult.unauthorized
+    )
+
+
+def test_path_rule_authorized_groups() -> None:
+    rule = PathRule(
+        pattern=r"\/a\/",
+        authorized=[
+            GitHubGroup(org="jsickcodes"),
+            GitHubGroup(org="lsst-sqre", team="Docs"),
+        ],
+    )
+    assert rule.authorized_orgs == {"jsickcodes"}
+    assert rule.authorized_teams == {("lsst-sqre", "Docs")}
+
+    assert rule.is_user_authorized(user_orgs={"jsickcodes"}, user_teams=set())
+    assert rule.is_user_authorized(
+        user_orgs={"lsst-sqre"}, user_teams={("lsst-sqre", "Docs")}
+    )
+    # Membership in a team's organization isn't sufficient
+    assert not rule.is_user_authorized(
+        user_orgs={"lsst-sqre"}, user_teams={("lsst-sqre", "Other")}
+    )
+
+
+@pytest.mark.asyncio
+async def test_set_serialized_github_memberships() -> None:
+    """Test set_serialized_github_memberships with mocked GitHub API
+    responses (the app's auth config is tests/githubauth.example.yaml).
+    """
+    responses = {
+        "/user/memberships/orgs": [
+            {"organization": {"login": "jsickcodes"}},
+            {"organization": {"login": "other-org"}},
+        ],
+        "/user/teams": [
+            {"organization": {"login": "jsickcodes"}, "name": "Red Team"},
+            {"organization": {"login": "other-org"}, "name": "Red Team"},
+        ],
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["per_page"] == "100"
+        return httpx.Response(200, json=responses[request.url.path])
+
+    session: Dict[str, Any] = {}
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    ) as http_client:
+        await set_serialized_github_memberships(
+            http_client=http_client, session=session, github_token="token"
+        )
+
+    assert session["github_memberships"] == {
+        "orgs": ["jsickcodes"],
+        "teams": [("jsickcodes", "Red Team")],
+    }
+
+
+def test_githubauth_immutable() -> None:
+    example_path = Path(__file__).parent / "githubauth.example.yaml"
+    github_auth = GitHubAuth.parse_yaml(example_path)
+
+    with pytest.raises(TypeError):
+        github_auth.default = ()
+    with pytest.raises(TypeError):
+        github_auth.paths[0].authorized = ()
+    with pytest.raises(AttributeError):
+        github_auth.paths.append(github_auth.paths[0])  # type: ignore
+
+
+def test_github_oauth_credentials() -> None:
+    github_oauth = GitHubOAuth(client_id="abc", client_secret="xyz")
+    client = github_oauth.oauth.github
+    assert client.client_id == "abc"
+    assert client.client_secret == "xyz"
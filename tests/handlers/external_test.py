@@ -0,0 +1,79 @@
+"""Tests for the external handlers."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from ltdproxy.config import get_config
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_get_s3_unauthenticated(client: AsyncClient) -> None:
+    """Test that an unauthenticated request to the proxy redirects to the
+    login page, with a ref back to the requested page.
+    """
+    response = await client.get("/myproject/v/dev/index.html?a=1&b=2")
+    assert response.status_code == 307
+    location = urlparse(response.headers["Location"])
+    assert location.path == "/login"
+    assert parse_qs(location.query) == {
+        "ref": ["https://example.com/myproject/v/dev/index.html?a=1&b=2"]
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_login_ref(client: AsyncClient) -> None:
+    """Test that the login redirect passes a same-site ref through the
+    OAuth callback URL, and drops a ref to another site.
+    """
+    ref = "https://example.com/myproject/v/dev/index.html?a=1&b=2"
+    response = await client.get("/login", params={"ref": ref})
+    assert response.status_code == 302
+    query = parse_qs(urlparse(response.headers["Location"]).query)
+    callback_url = urlparse(query["redirect_uri"][0])
+    assert callback_url.path == "/auth"
+    assert parse_qs(callback_url.query) == {"ref": [ref]}
+
+    response = await client.get(
+        "/login", params={"ref": "https://evil.example.org/"}
+    )
+    query = parse_qs(urlparse(response.headers["Location"]).query)
+    assert urlparse(query["redirect_uri"][0]).query == ""
+
+
+@pytest.mark.asyncio
+async def test_get_login_ref_callback_query(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the ref is appended to a callback URL that already has a
+    query string.
+    """
+    monkeypatch.setenv(
+        "LTDPROXY_GITHUB_CALLBACK_URL", "http://127.0.0.1:8000/auth?a=1"
+    )
+    get_config.cache_clear()
+    try:
+        ref = "https://example.com/myproject/"
+        response = await client.get("/login", params={"ref": ref})
+    finally:
+        monkeypatch.undo()
+        get_config.cache_clear()
+    query = parse_qs(urlparse(response.headers["Location"]).query)
+    callback_url = urlparse(query["redirect_uri"][0])
+    assert callback_url.path == "/auth"
+    assert parse_qs(callback_url.query) == {"a": ["1"], "ref": [ref]}
+
+
+@pytest.mark.asyncio
+async def test_get_logged_out(client: AsyncClient) -> None:
+    for _ in range(2):
+        response = await client.get("/logged-out")
+        assert response.status_code == 200
+        assert response.text == "<h1>You're logged out.</h1>"
+        assert response.headers["content-type"].startswith("text/html")
@@ -15,3 +15,5 @@ async def test_get_healthz(client: AsyncClient) -> None:
     """Test ``GET /__healthz``"""
     response = await client.get("/__healthz")
     assert response.status_code == 200
+    assert response.text == "OK"
+    assert response.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,33 @@
+"""Tests for the httpclient module."""
+
+from __future__ import annotations
+
+import pytest
+
+from ltdproxy.httpclient import HTTP_LIMITS, HTTP_TIMEOUT, HTTPClientDependency
+
+
+@pytest.mark.asyncio
+async def test_http_client_dependency() -> None:
+    dependency = HTTPClientDependency()
+    http_client = await dependency()
+    assert await dependency() is http_client
+    assert http_client.follow_redirects
+    assert http_client.timeout == HTTP_TIMEOUT
+
+    pool = http_client._transport._pool  # type: ignore[attr-defined]
+    assert pool._max_connections == HTTP_LIMITS.max_connections
+    assert pool._keepalive_expiry == HTTP_LIMITS.keepalive_expiry
+    assert not pool._http2
+
+    await dependency.aclose()
+    assert http_client.is_closed
+    assert dependency.http_client is None
+
+
+@pytest.mark.asyncio
+async def test_http2_client_dependency() -> None:
+    dependency = HTTPClientDependency(http2=True)
+    http_client = await dependency()
+    assert http_client._transport._pool._http2  # type: ignore[attr-defined]
+    await dependency.aclose()
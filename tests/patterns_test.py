@@ -0,0 +1,31 @@
+"""Tests for the patterns module."""
+
+from __future__ import annotations
+
+import re
+
+from ltdproxy.patterns import combine_patterns, match_index
+
+
+def test_combine_patterns() -> None:
+    pattern = combine_patterns(
+        [re.compile(r"\/a\/"), re.compile(r"\/b\/"), re.compile(r"\/")]
+    )
+    assert pattern is not None
+    assert match_index(pattern, "/a/index.html") == 0
+    assert match_index(pattern, "/b/index.html") == 1
+    assert match_index(pattern, "/c/index.html") == 2
+    assert match_index(pattern, "c/index.html") is None
+
+
+def test_combine_patterns_fallback() -> None:
+    assert combine_patterns([]) is None
+    # Capturing groups
+    assert combine_patterns([re.compile(r"\/(a)\/\1")]) is None
+    # Mixed flags
+    assert (
+        combine_patterns([re.compile("a"), re.compile("b", re.IGNORECASE)])
+        is None
+    )
+    # Inline global flags
+    assert combine_patterns([re.compile("a"), re.compile("(?i)b")]) is None
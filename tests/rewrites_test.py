@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import re
 from pathlib import Path
 
 import httpx
 import pytest
+from starlette.responses import StreamingResponse
 
-from ltdproxy.rewrites import RewriteEngine
+from ltdproxy.rewrites import (
+    BUFFERED_RESPONSE_SIZE,
+    RewriteEngine,
+    RewriteRule,
+)
+from tests.support import UpstreamStream
 
 
 @pytest.mark.asyncio
@@ -24,3 +31,109 @@ async def test_rule_matching() -> None:
     assert rule.substitution == "http://spherex-doc-portal/"
 
     assert engine.find_matching_rule("/mydoc/") is None
+
+
+@pytest.mark.asyncio
+async def test_rule_matching_order() -> None:
+    http_client = httpx.AsyncClient()
+    rules = [
+        RewriteRule.parse_obj({"pattern": p, "substitution": s})
+        for p, s in (
+            (r"^/a/b", "http://first/"),
+            (r"^/a", "http://second/"),
+            (r"^/(c|d)/", "http://third/"),
+        )
+    ]
+    assert all(rule.pattern.flags & re.ASCII for rule in rules)
+    engine = RewriteEngine(rewrite_rules=rules[:2], http_client=http_client)
+    for path, expected in (
+        ("/a/b/index.html", "http://first/"),
+        ("/a/index.html", "http://second/"),
+    ):
+        result = engine.find_matching_rule(path)
+        assert result is not None
+        rule, m = result
+        assert rule.substitution == expected
+        assert m.re is rule.pattern
+    assert engine.find_matching_rule("/b/") is None
+
+    # Patterns with capturing groups are matched one at a time
+    engine = RewriteEngine(rewrite_rules=rules, http_client=http_client)
+    result = engine.find_matching_rule("/d/index.html")
+    assert result is not None
+    rule, m = result
+    assert rule.substitution == "http://third/"
+    assert m.group(1) == "d"
+
+
+@pytest.mark.asyncio
+async def test_build_stream() -> None:
+    requested_urls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_urls.append(str(request.url))
+        return httpx.Response(200, text="hello")
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    config_path = Path(__file__).parent / "rewrites.example.yaml"
+    engine = RewriteEngine.init_from_file(
+        path=config_path, http_client=http_client
+    )
+
+    assert engine.resolve_url("/") == "http://spherex-doc-portal/"
+    assert engine.resolve_url("/mydoc/") is None
+
+    for _ in range(2):
+        stream = await engine.build_stream("/")
+        assert stream is not None
+        await stream.aclose()
+        assert await engine.build_stream("/mydoc/") is None
+    assert requested_urls == ["http://spherex-doc-portal/"] * 2
+
+
+@pytest.mark.asyncio
+async def test_build_response() -> None:
+    size = BUFFERED_RESPONSE_SIZE - 1
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "text/html", "Content-Length": str(size)},
+            stream=UpstreamStream(b"x" * size),
+        )
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    config_path = Path(__file__).parent / "rewrites.example.yaml"
+    engine = RewriteEngine.init_from_file(
+        path=config_path, http_client=http_client
+    )
+
+    response = await engine.build_response("/")
+    assert response is not None
+    assert not isinstance(response, StreamingResponse)
+    assert response.body == b"x" * size
+    assert response.headers["content-type"] == "text/html"
+    assert response.headers["content-length"] == str(size)
+    assert await engine.build_response("/mydoc/") is None
+
+    size = BUFFERED_RESPONSE_SIZE
+    response = await engine.build_response("/")
+    assert isinstance(response, StreamingResponse)
+    assert response.headers["content-length"] == str(size)
+    assert response.background is not None
+    await response.background()
+
+
+@pytest.mark.asyncio
+async def test_empty_rules() -> None:
+    http_client = httpx.AsyncClient()
+    engine = RewriteEngine(rewrite_rules=[], http_client=http_client)
+    assert engine.empty
+    assert engine.find_matching_rule("/") is None
+    assert await engine.build_response("/") is None
+
+    config_path = Path(__file__).parent / "rewrites.example.yaml"
+    engine = RewriteEngine.init_from_file(
+        path=config_path, http_client=http_client
+    )
+    assert not engine.empty
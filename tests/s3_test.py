@@ -0,0 +1,60 @@
+"""Tests for the s3 module."""
+
+from __future__ import annotations
+
+import time
+
+import httpx
+import pytest
+
+from ltdproxy import s3
+from ltdproxy.s3 import SIGNATURE_TTL, Bucket
+
+
+def make_bucket() -> Bucket:
+    return Bucket(
+        bucket="example-bucket",
+        region="us-east-1",
+        access_key_id="AKIDEXAMPLE",
+        secret_access_key="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY",
+    )
+
+
+def test_build_request() -> None:
+    bucket = make_bucket()
+    http_client = httpx.AsyncClient()
+    for key in ("a/index.html", "b/style.css"):
+        request = bucket.build_request(http_client, key)
+        assert request.method == "GET"
+        assert str(request.url) == (
+            f"https://example-bucket.s3.us-east-1.amazonaws.com/{key}"
+        )
+        assert request.headers["authorization"].startswith(
+            "AWS4-HMAC-SHA256 Credential=AKIDEXAMPLE/"
+        )
+        assert "x-amz-date" in request.headers
+
+
+def test_signed_headers_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    bucket = make_bucket()
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    url = "https://example-bucket.s3.us-east-1.amazonaws.com/a/index.html"
+
+    headers = bucket._sign_headers(url)
+    assert bucket._sign_headers(url) is headers
+
+    now += SIGNATURE_TTL
+    assert bucket._sign_headers(url) is not headers
+    assert len(bucket._signed_headers) == 1
+
+
+def test_signed_headers_cache_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(s3, "SIGNATURE_CACHE_SIZE", 2)
+    bucket = make_bucket()
+    for key in ("a", "b", "c"):
+        bucket._sign_headers(f"https://example.com/{key}")
+    assert list(bucket._signed_headers) == [
+        "https://example.com/b",
+        "https://example.com/c",
+    ]
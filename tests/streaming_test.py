@@ -0,0 +1,66 @@
+"""Tests for the streaming module."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List
+
+import httpx
+import pytest
+from starlette.types import Message
+
+from ltdproxy.streaming import build_streaming_response
+from tests.support import UpstreamStream
+
+
+async def open_stream(**kwargs: Any) -> httpx.Response:
+    """Send a request, getting a streaming response with a 200 status and
+    the given content arguments.
+    """
+    http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, **kwargs)
+        )
+    )
+    request = http_client.build_request("GET", "https://example.com/")
+    return await http_client.send(request, stream=True)
+
+
+async def send_streaming_response(
+    stream: httpx.Response, messages: List[Message]
+) -> None:
+    """Send a streaming response for an upstream response to a client that
+    doesn't disconnect.
+    """
+    response = build_streaming_response(
+        stream, headers={"Content-type": "text/plain"}
+    )
+
+    async def receive() -> Message:
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await response({"type": "http"}, receive, send)
+
+
+@pytest.mark.asyncio
+async def test_build_streaming_response() -> None:
+    stream = await open_stream(stream=UpstreamStream())
+    messages: List[Any] = []
+    await send_streaming_response(stream, messages)
+
+    assert stream.is_closed
+    assert messages[0]["headers"] == [(b"content-type", b"text/plain")]
+    assert b"".join(m.get("body", b"") for m in messages) == b"hello"
+
+
+@pytest.mark.asyncio
+async def test_build_streaming_response_read_error() -> None:
+    stream = await open_stream(stream=UpstreamStream(fail=True))
+    messages: List[Any] = []
+    with pytest.raises(httpx.ReadError):
+        await send_streaming_response(stream, messages)
+    assert stream.is_closed
@@ -0,0 +1,26 @@
+"""Shared helpers for ltd-proxy tests."""
+
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+import httpx
+
+
+class UpstreamStream(httpx.AsyncByteStream):
+    """A mock upstream response body that can fail after its content.
+
+    Unlike a response created with ``content``, a response with this stream
+    isn't read in advance, so it can be read with ``aiter_raw``.
+    """
+
+    def __init__(
+        self, content: bytes = b"hello", *, fail: bool = False
+    ) -> None:
+        self.content = content
+        self.fail = fail
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self.content
+        if self.fail:
+            raise httpx.ReadError("connection lost")
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import pytest
 
-from ltdproxy.urlmap import map_s3_path
+from ltdproxy.urlmap import create_s3_path_mapper, map_s3_path
 
 
 @pytest.mark.parametrize(
@@ -110,6 +110,46 @@ from ltdproxy.urlmap import map_s3_path
             "myproject/_dashboard-assets/app.css",
             "prefix/myproject/_dashboard-assets/app.css",
         ),
+        (
+            "",
+            "myproject/_dashboard-assets/",
+            "myproject/_dashboard-assets",
+        ),
+        (
+            "",
+            "MyProject/V/Dev/a/B.html",
+            "myproject/v/Dev/a/B.html",
+        ),
+        (
+            "",
+            "myproject/builds/1/",
+            "myproject/builds/1/index.html",
+        ),
+        (
+            "",
+            "myproject/builds/1/a/b.css",
+            "myproject/builds/1/a/b.css",
+        ),
+        (
+            "",
+            "myproject/a/b/",
+            "myproject/v/__main/a/b/index.html",
+        ),
+        (
+            "",
+            "myproject/v/dev/",
+            "myproject/v/dev/index.html",
+        ),
+        (
+            "",
+            "myproject/builds/1",
+            "myproject/builds/1",
+        ),
+        (
+            "prefix",
+            "myproject/_dashboard-assets/css//",
+            "prefix/myproject/_dashboard-assets/css",
+        ),
     ],
 )
 def test_map_s3_path(
@@ -117,3 +157,18 @@ def test_map_s3_path(
 ) -> None:
     result = map_s3_path(bucket_prefix, request_path)
     assert result == expected_bucket_path
+
+    map_path = create_s3_path_mapper(bucket_prefix)
+    assert map_path(request_path) == expected_bucket_path
+
+
+def test_map_s3_path_cache() -> None:
+    map_s3_path.cache_clear()
+    for _ in range(3):
+        assert map_s3_path("", "myproject/") == "myproject/v/__main/index.html"
+    assert map_s3_path.cache_info().hits == 2
+
+    map_path = create_s3_path_mapper("prefix")
+    for _ in range(3):
+        assert map_path("myproject/") == "prefix/myproject/v/__main/index.html"
+    assert map_path.cache_info().hits == 2  # type: ignore[attr-defined]